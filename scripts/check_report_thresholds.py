@@ -8,6 +8,8 @@ from typing import Any
 
 
 def _to_float(value: Any, default: float = 0.0) -> float:
+    if isinstance(value, float):
+        return value
     try:
         return float(value)
     except (TypeError, ValueError):
@@ -15,6 +17,8 @@ def _to_float(value: Any, default: float = 0.0) -> float:
 
 
 def _to_int(value: Any, default: int = 0) -> int:
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except (TypeError, ValueError):
@@ -32,7 +36,7 @@ def main() -> int:
     args = parser.parse_args()
 
     report_path = Path(args.report)
-    payload = json.loads(report_path.read_text(encoding="utf-8"))
+    payload = json.loads(report_path.read_bytes())
 
     summary = payload.get("summary", {})
     counts = summary.get("counts", {})
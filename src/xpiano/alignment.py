@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from dataclasses import dataclass
-from math import inf, log
+from collections.abc import Callable
+from math import inf
+from typing import Any
 
-from xpiano.models import AlignmentResult, NoteEvent, ScorePosition
+import numpy as np
+
+from xpiano.models import AlignmentResult, NoteArrays, NoteEvent, ScorePosition
 
 
 class Aligner(ABC):
@@ -24,62 +26,257 @@ class OnlineAligner(ABC):
         raise NotImplementedError
 
 
-@dataclass
-class _IndexedNote:
-    idx: int
-    note: NoteEvent
-
-
-def _sequence_align_pairs(
-    ref_onsets: list[float],
-    attempt_onsets: list[float],
-    gap_penalty_sec: float,
-) -> tuple[list[tuple[int, int]], float]:
-    m = len(ref_onsets)
-    n = len(attempt_onsets)
-    dp: list[list[float]] = [[inf] * (n + 1) for _ in range(m + 1)]
-    back: list[list[str | None]] = [[None] * (n + 1) for _ in range(m + 1)]
-    dp[0][0] = 0.0
-
-    for i in range(1, m + 1):
-        dp[i][0] = dp[i - 1][0] + gap_penalty_sec
-        back[i][0] = "up"
-    for j in range(1, n + 1):
-        dp[0][j] = dp[0][j - 1] + gap_penalty_sec
-        back[0][j] = "left"
-
+_DIAG = 1
+_UP = 2
+_LEFT = 3
+
+
+# Below this many columns per row, NumPy call overhead outweighs vectorizing.
+_VECTOR_MIN_COLS = 128
+# From this many cells per anti-diagonal, whole-diagonal steps beat row sweeps.
+_ANTIDIAGONAL_MIN_CELLS = 512
+
+
+MatchCosts = Callable[[Any, Any], np.ndarray]
+RowCosts = Callable[[int, int, int], list[float]]
+
+
+def _band_width(m: int, n: int, band_radius: int | None) -> int:
+    return max(m, n) if band_radius is None else max(band_radius, abs(m - n))
+
+
+def _borders(
+    m: int,
+    n: int,
+    skip_ref_cost: float,
+    skip_attempt_cost: float,
+    width: int,
+) -> tuple[list[float], list[float]]:
+    first_row = [0.0] * (min(n, width) + 1)
+    for j in range(1, len(first_row)):
+        first_row[j] = first_row[j - 1] + skip_attempt_cost
+    first_col = [0.0] * (min(m, width) + 1)
+    for i in range(1, len(first_col)):
+        first_col[i] = first_col[i - 1] + skip_ref_cost
+    return first_row, first_col
+
+
+def _fill_dp(
+    match_costs: MatchCosts,
+    m: int,
+    n: int,
+    skip_ref_cost: float,
+    skip_attempt_cost: float,
+    band_radius: int | None = None,
+) -> tuple[float, np.ndarray]:
+    """Shared match/skip recurrence; returns the total cost and backpointers.
+
+    ``match_costs(ref_idx, attempt_idx)`` evaluates match costs elementwise for
+    index arrays (or slices), so no dense ``m x n`` cost or score table is
+    kept: only the int8 backpointers are. With ``band_radius`` only cells with
+    ``|i - j| <= max(band_radius, |m - n|)`` (Sakoe-Chiba band) are filled.
+    """
+    width = _band_width(m, n, band_radius)
+    back = np.zeros((m + 1, n + 1), dtype=np.int8)
+    back[1:, 0] = _UP
+    back[0, 1:] = _LEFT
+    first_row, first_col = _borders(m, n, skip_ref_cost, skip_attempt_cost, width)
+    if min(m, n, 2 * width + 1) >= _ANTIDIAGONAL_MIN_CELLS:
+        sweep = _sweep_antidiagonals
+    else:
+        sweep = _sweep_rows
+    total = sweep(back, match_costs, first_row, first_col, skip_ref_cost, skip_attempt_cost, width)
+    return total, back
+
+
+def _sweep_rows(
+    back: np.ndarray,
+    match_costs: MatchCosts,
+    first_row: list[float],
+    first_col: list[float],
+    skip_ref_cost: float,
+    skip_attempt_cost: float,
+    width: int,
+) -> float:
+    m = back.shape[0] - 1
+    n = back.shape[1] - 1
+    prev_row = np.full(n + 1, inf)
+    prev_row[: len(first_row)] = first_row
     for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            match = dp[i - 1][j - 1] + \
-                abs(ref_onsets[i - 1] - attempt_onsets[j - 1])
-            skip_ref = dp[i - 1][j] + gap_penalty_sec
-            skip_attempt = dp[i][j - 1] + gap_penalty_sec
-            best = min(match, skip_ref, skip_attempt)
-            dp[i][j] = best
-            if best == match:
-                back[i][j] = "diag"
-            elif best == skip_ref:
-                back[i][j] = "up"
+        lo = max(1, i - width)
+        hi = min(n, i + width)
+        row = np.full(n + 1, inf)
+        if i < len(first_col):
+            row[0] = first_col[i]
+        # Match and skip-ref only depend on the previous row: vectorize them.
+        match = prev_row[lo - 1: hi] + match_costs(i - 1, slice(lo - 1, hi))
+        skip_ref = prev_row[lo: hi + 1] + skip_ref_cost
+        take_match = match <= skip_ref
+        back[i, lo: hi + 1] = np.where(take_match, _DIAG, _UP)
+        # Skip-attempt depends on the cell to the left, so sweep serially.
+        best = float(row[lo - 1])
+        values: list[float] = []
+        left_cols: list[int] = []
+        for j, candidate in enumerate(np.where(take_match, match, skip_ref).tolist(), start=lo):
+            skip_attempt = best + skip_attempt_cost
+            if skip_attempt < candidate:
+                best = skip_attempt
+                left_cols.append(j)
             else:
-                back[i][j] = "left"
+                best = candidate
+            values.append(best)
+        row[lo: hi + 1] = values
+        if left_cols:
+            back[i, left_cols] = _LEFT
+        prev_row = row
+    return float(prev_row[n])
+
+
+def _sweep_antidiagonals(
+    back: np.ndarray,
+    match_costs: MatchCosts,
+    first_row: list[float],
+    first_col: list[float],
+    skip_ref_cost: float,
+    skip_attempt_cost: float,
+    width: int,
+) -> float:
+    # Cells on anti-diagonal i + j = d only depend on diagonals d-1 and d-2,
+    # so each diagonal is one vectorized step with no serial dependency.
+    # Diagonal buffers are indexed by row i.
+    m = back.shape[0] - 1
+    n = back.shape[1] - 1
+    flat_back = back.reshape(-1)
+    before_prev = np.full(m + 1, inf)
+    before_prev[0] = 0.0
+    prev = np.full(m + 1, inf)
+    if len(first_row) > 1:
+        prev[0] = first_row[1]
+    if len(first_col) > 1:
+        prev[1] = first_col[1]
+    for d in range(2, m + n + 1):
+        diag = np.full(m + 1, inf)
+        if d < len(first_row):
+            diag[0] = first_row[d]
+        if d < len(first_col):
+            diag[d] = first_col[d]
+        lo = max(1, d - n, (d - width + 1) // 2)
+        hi = min(m, d - 1, (d + width) // 2)
+        if lo <= hi:
+            rows = np.arange(lo, hi + 1)
+            match = before_prev[lo - 1: hi] + match_costs(rows - 1, d - rows - 1)
+            skip_ref = prev[lo - 1: hi] + skip_ref_cost
+            skip_attempt = prev[lo: hi + 1] + skip_attempt_cost
+            best = np.minimum(np.minimum(match, skip_ref), skip_attempt)
+            diag[lo: hi + 1] = best
+            flat_back[rows * n + d] = np.where(best == match, _DIAG, np.where(best == skip_ref, _UP, _LEFT))
+        before_prev = prev
+        prev = diag
+    return float(prev[m])
+
+
+def _fill_dp_scalar(
+    row_costs: RowCosts,
+    m: int,
+    n: int,
+    skip_ref_cost: float,
+    skip_attempt_cost: float,
+    width: int,
+) -> tuple[float, list[list[int]]]:
+    """Plain-list variant of ``_fill_dp`` for narrow grids (same results).
+
+    ``row_costs(i, start, stop)`` lists match costs of ref note ``i`` against
+    attempt notes ``start:stop``.
+    """
+    back = [[_UP] * (n + 1) for _ in range(m + 1)]
+    back[0] = [_LEFT] * (n + 1)
+    first_row, first_col = _borders(m, n, skip_ref_cost, skip_attempt_cost, width)
+    prev_row = first_row + [inf] * (n + 1 - len(first_row))
 
+    for i in range(1, m + 1):
+        row = [inf] * (n + 1)
+        if i < len(first_col):
+            row[0] = first_col[i]
+        lo = i - width if i > width else 1
+        hi = i + width if i + width < n else n
+        costs = row_costs(i - 1, lo - 1, hi)
+        back_row = back[i]
+        best_left = row[lo - 1]
+        for j in range(lo, hi + 1):
+            # Two compares pick the winner in match > skip-ref > skip-attempt
+            # tie order; back rows default to _UP.
+            best = prev_row[j - 1] + costs[j - lo]
+            step = _DIAG
+            skip_ref = prev_row[j] + skip_ref_cost
+            if skip_ref < best:
+                best = skip_ref
+                step = _UP
+            skip_attempt = best_left + skip_attempt_cost
+            if skip_attempt < best:
+                best = skip_attempt
+                step = _LEFT
+            row[j] = best_left = best
+            if step != _UP:
+                back_row[j] = step
+        prev_row = row
+    return prev_row[n], back
+
+
+def _traceback(back: np.ndarray | list[list[int]], m: int, n: int) -> list[tuple[int, int]]:
     pairs: list[tuple[int, int]] = []
     i = m
     j = n
     while i > 0 or j > 0:
         step = back[i][j]
-        if step == "diag":
+        if step == _DIAG:
             pairs.append((i - 1, j - 1))
             i -= 1
             j -= 1
-        elif step == "up":
+        elif step == _UP:
             i -= 1
-        elif step == "left":
+        elif step == _LEFT:
             j -= 1
         else:
             break
     pairs.reverse()
-    return pairs, dp[m][n]
+    return pairs
+
+
+def _sequence_align_pairs(
+    ref_onsets: list[float],
+    attempt_onsets: list[float],
+    gap_penalty_sec: float,
+    band_radius: int | None = None,
+) -> tuple[list[tuple[int, int]], float]:
+    m = len(ref_onsets)
+    n = len(attempt_onsets)
+    if m == 1 and n == 1 and (band_radius is None or band_radius > 0):
+        # Single note on each side (the common per-pitch case): match iff it
+        # beats skipping both notes.
+        onset_cost = abs(ref_onsets[0] - attempt_onsets[0])
+        skip_cost = gap_penalty_sec + gap_penalty_sec
+        if onset_cost <= skip_cost:
+            return [(0, 0)], onset_cost
+        return [], skip_cost
+    width = _band_width(m, n, band_radius)
+    if min(n, 2 * width + 1) < _VECTOR_MIN_COLS:
+        def row_costs(i: int, start: int, stop: int) -> list[float]:
+            ref_onset = ref_onsets[i]
+            return [abs(ref_onset - attempt_onset) for attempt_onset in attempt_onsets[start:stop]]
+
+        total, back = _fill_dp_scalar(row_costs, m, n, gap_penalty_sec, gap_penalty_sec, width)
+        return _traceback(back, m, n), total
+    ref_arr = np.asarray(ref_onsets, dtype=np.float64)
+    attempt_arr = np.asarray(attempt_onsets, dtype=np.float64)
+    total, back_arr = _fill_dp(
+        lambda ref_idx, attempt_idx: np.abs(ref_arr[ref_idx] - attempt_arr[attempt_idx]),
+        m,
+        n,
+        skip_ref_cost=gap_penalty_sec,
+        skip_attempt_cost=gap_penalty_sec,
+        band_radius=band_radius,
+    )
+    return _traceback(back_arr, m, n), total
 
 
 def _estimate_affine_warp(
@@ -105,32 +302,43 @@ def _estimate_affine_warp(
     return scale, offset
 
 
-def _warp_attempt_start(start_sec: float, scale: float, offset_sec: float) -> float:
-    return (start_sec * scale) + offset_sec
+def _pitch_buckets(notes: list[NoteEvent]) -> dict[int, tuple[list[int], list[float]]]:
+    """Group note indices and onsets by pitch, indices ascending per bucket."""
+    arrays = NoteArrays.from_notes(notes)
+    order = np.argsort(arrays.pitch, kind="stable")
+    keys, starts = np.unique(arrays.pitch[order], return_index=True)
+    bounds = starts.tolist() + [len(notes)]
+    sorted_idx = order.tolist()
+    sorted_onsets = arrays.start_sec[order].tolist()
+    return {
+        pitch: (sorted_idx[lo:hi], sorted_onsets[lo:hi])
+        for pitch, lo, hi in zip(keys.tolist(), bounds, bounds[1:])
+    }
+
+
+def _check_band_radius(band_radius: int | None) -> None:
+    if band_radius is not None and band_radius < 0:
+        raise ValueError("band_radius must be >= 0")
 
 
 class DTWAligner(Aligner):
-    def __init__(self, gap_penalty_sec: float = 0.20):
+    def __init__(self, gap_penalty_sec: float = 0.20, band_radius: int | None = None):
+        _check_band_radius(band_radius)
         self.gap_penalty_sec = gap_penalty_sec
+        self.band_radius = band_radius
 
     def align_offline(self, ref: list[NoteEvent], attempt: list[NoteEvent]) -> AlignmentResult:
-        ref_by_pitch: dict[int, list[_IndexedNote]] = defaultdict(list)
-        attempt_by_pitch: dict[int, list[_IndexedNote]] = defaultdict(list)
-
-        for idx, note in enumerate(ref):
-            ref_by_pitch[note.pitch].append(_IndexedNote(idx=idx, note=note))
-        for idx, note in enumerate(attempt):
-            attempt_by_pitch[note.pitch].append(
-                _IndexedNote(idx=idx, note=note))
-
-        merged_path: list[tuple[int, int]] = []
+        ref_buckets = _pitch_buckets(ref)
+        attempt_buckets = _pitch_buckets(attempt)
+        # Each ref note is matched at most once, so slotting pairs by ref index
+        # yields the merged path in order without a sort.
+        slots: list[tuple[int, int] | None] = [None] * len(ref)
         total_cost = 0.0
-        pitches = sorted(set(ref_by_pitch.keys()) |
-                         set(attempt_by_pitch.keys()))
+        empty: tuple[list[int], list[float]] = ([], [])
 
-        for pitch in pitches:
-            ref_bucket = ref_by_pitch.get(pitch, [])
-            attempt_bucket = attempt_by_pitch.get(pitch, [])
+        for pitch in sorted(ref_buckets.keys() | attempt_buckets.keys()):
+            ref_bucket, ref_onsets = ref_buckets.get(pitch, empty)
+            attempt_bucket, attempt_onsets = attempt_buckets.get(pitch, empty)
             if not ref_bucket or not attempt_bucket:
                 # Gap-only cost for unmatched notes.
                 total_cost += (len(ref_bucket) +
@@ -138,20 +346,17 @@ class DTWAligner(Aligner):
                 continue
 
             local_pairs, local_cost = _sequence_align_pairs(
-                ref_onsets=[n.note.start_sec for n in ref_bucket],
-                attempt_onsets=[n.note.start_sec for n in attempt_bucket],
+                ref_onsets=ref_onsets,
+                attempt_onsets=attempt_onsets,
                 gap_penalty_sec=self.gap_penalty_sec,
+                band_radius=self.band_radius,
             )
             total_cost += local_cost
             for ref_local_idx, attempt_local_idx in local_pairs:
-                merged_path.append(
-                    (
-                        ref_bucket[ref_local_idx].idx,
-                        attempt_bucket[attempt_local_idx].idx,
-                    )
-                )
+                ref_idx = ref_bucket[ref_local_idx]
+                slots[ref_idx] = (ref_idx, attempt_bucket[attempt_local_idx])
 
-        merged_path.sort()
+        merged_path = [pair for pair in slots if pair is not None]
         return AlignmentResult(path=merged_path, cost=total_cost, method="per_pitch_dtw")
 
 
@@ -164,39 +369,48 @@ class HMMAligner(Aligner):
         duration_cost_weight: float = 0.20,
         match_reward: float = 0.20,
         max_onset_gap_sec: float = 2.50,
+        band_radius: int | None = None,
     ):
+        _check_band_radius(band_radius)
         self.delete_cost = delete_cost
         self.insert_cost = insert_cost
         self.onset_cost_weight = onset_cost_weight
         self.duration_cost_weight = duration_cost_weight
         self.match_reward = match_reward
         self.max_onset_gap_sec = max_onset_gap_sec
+        self.band_radius = band_radius
 
-    def _match_cost(
+    def _match_costs(
         self,
-        ref_note: NoteEvent,
-        attempt_note: NoteEvent,
-        warped_attempt_start: float,
-    ) -> float:
-        if ref_note.pitch != attempt_note.pitch:
-            return inf
-
-        onset_gap = abs(ref_note.start_sec - warped_attempt_start)
-        if onset_gap > self.max_onset_gap_sec:
-            return inf
-
-        if ref_note.dur_sec > 0 and attempt_note.dur_sec > 0:
-            duration_ratio = attempt_note.dur_sec / ref_note.dur_sec
-            duration_penalty = abs(log(max(duration_ratio, 1e-9)))
-        else:
-            duration_penalty = 0.0
+        ref: NoteArrays,
+        attempt: NoteArrays,
+        warped_attempt_starts: np.ndarray,
+    ) -> MatchCosts:
+        ref_pitch = ref.pitch
+        ref_start = ref.start_sec
+        ref_dur = ref.dur_sec
+        attempt_pitch = attempt.pitch
+        attempt_dur = attempt.dur_sec
+
+        def match_costs(ref_idx: Any, attempt_idx: Any) -> np.ndarray:
+            onset_gap = np.abs(ref_start[ref_idx] - warped_attempt_starts[attempt_idx])
+            ref_durs = ref_dur[ref_idx]
+            attempt_durs = attempt_dur[attempt_idx]
+            duration_penalty = np.where(
+                (ref_durs > 0) & (attempt_durs > 0),
+                np.abs(np.log(np.maximum(attempt_durs / np.where(ref_durs > 0, ref_durs, 1.0), 1e-9))),
+                0.0,
+            )
+            cost = np.maximum(
+                0.0,
+                onset_gap * self.onset_cost_weight
+                + duration_penalty * self.duration_cost_weight
+                - self.match_reward,
+            )
+            cost[(ref_pitch[ref_idx] != attempt_pitch[attempt_idx]) | (onset_gap > self.max_onset_gap_sec)] = inf
+            return cost
 
-        raw_cost = (
-            onset_gap * self.onset_cost_weight
-            + duration_penalty * self.duration_cost_weight
-            - self.match_reward
-        )
-        return max(0.0, raw_cost)
+        return match_costs
 
     def align_offline(
         self,
@@ -218,67 +432,50 @@ class HMMAligner(Aligner):
 
         m = len(ref)
         n = len(attempt)
-        dp: list[list[float]] = [[inf] * (n + 1) for _ in range(m + 1)]
-        back: list[list[str | None]] = [[None] * (n + 1) for _ in range(m + 1)]
-        dp[0][0] = 0.0
-
-        for i in range(1, m + 1):
-            dp[i][0] = dp[i - 1][0] + self.delete_cost
-            back[i][0] = "up"
-        for j in range(1, n + 1):
-            dp[0][j] = dp[0][j - 1] + self.insert_cost
-            back[0][j] = "left"
-
-        warped_attempt_starts = [
-            _warp_attempt_start(
-                start_sec=note.start_sec,
-                scale=scale,
-                offset_sec=offset_sec,
+        ref_arrays = NoteArrays.from_notes(ref)
+        attempt_arrays = NoteArrays.from_notes(attempt)
+        warped_attempt_starts = (attempt_arrays.start_sec * scale) + offset_sec
+        match_costs = self._match_costs(ref_arrays, attempt_arrays, warped_attempt_starts)
+        if m == n and np.array_equal(ref_arrays.pitch, attempt_arrays.pitch):
+            # Any path other than the diagonal pays at least one delete plus one
+            # insert, so a cheaper diagonal is the unique Viterbi optimum.
+            diagonal_cost = 0.0
+            for cost in match_costs(slice(None), slice(None)).tolist():
+                diagonal_cost += cost
+            if diagonal_cost < self.delete_cost + self.insert_cost:
+                return AlignmentResult(
+                    path=[(idx, idx) for idx in range(m)],
+                    cost=diagonal_cost,
+                    method="hmm_viterbi",
+                    warp_scale=scale,
+                    warp_offset_sec=offset_sec,
+                )
+        width = _band_width(m, n, self.band_radius)
+        back: np.ndarray | list[list[int]]
+        if min(n, 2 * width + 1) < _VECTOR_MIN_COLS:
+            total_cost, back = _fill_dp_scalar(
+                lambda i, start, stop: match_costs(i, slice(start, stop)).tolist(),
+                m,
+                n,
+                self.delete_cost,
+                self.insert_cost,
+                width,
             )
-            for note in attempt
+        else:
+            total_cost, back = _fill_dp(
+                match_costs,
+                m,
+                n,
+                skip_ref_cost=self.delete_cost,
+                skip_attempt_cost=self.insert_cost,
+                band_radius=self.band_radius,
+            )
+        path = [
+            (ref_idx, attempt_idx)
+            for ref_idx, attempt_idx in _traceback(back, m, n)
+            if ref[ref_idx].pitch == attempt[attempt_idx].pitch
         ]
 
-        for i in range(1, m + 1):
-            ref_note = ref[i - 1]
-            for j in range(1, n + 1):
-                match_cost = self._match_cost(
-                    ref_note=ref_note,
-                    attempt_note=attempt[j - 1],
-                    warped_attempt_start=warped_attempt_starts[j - 1],
-                )
-                match = dp[i - 1][j - 1] + match_cost
-                skip_ref = dp[i - 1][j] + self.delete_cost
-                skip_attempt = dp[i][j - 1] + self.insert_cost
-                best = min(match, skip_ref, skip_attempt)
-                dp[i][j] = best
-                if best == match:
-                    back[i][j] = "diag"
-                elif best == skip_ref:
-                    back[i][j] = "up"
-                else:
-                    back[i][j] = "left"
-
-        i = m
-        j = n
-        path: list[tuple[int, int]] = []
-        while i > 0 or j > 0:
-            step = back[i][j]
-            if step == "diag":
-                ref_idx = i - 1
-                attempt_idx = j - 1
-                if ref[ref_idx].pitch == attempt[attempt_idx].pitch:
-                    path.append((ref_idx, attempt_idx))
-                i -= 1
-                j -= 1
-            elif step == "up":
-                i -= 1
-            elif step == "left":
-                j -= 1
-            else:
-                break
-        path.reverse()
-
-        total_cost = dp[m][n]
         if total_cost == inf:
             total_cost = (m * self.delete_cost) + (n * self.insert_cost)
 
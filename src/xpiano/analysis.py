@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
-from statistics import median
+from dataclasses import dataclass
+
+import numpy as np
 
 from xpiano.alignment import Aligner, HMMAligner
 from xpiano.events import generate_events
-from xpiano.models import AlignmentResult, AnalysisEvent, NoteEvent
+from xpiano.models import AlignmentResult, AnalysisEvent, NoteArrays, NoteEvent
 from xpiano.parser import midi_to_notes
 
 
@@ -21,18 +22,27 @@ class AnalysisResult:
     matched: int
 
 
-def _dedup_ref_count(notes: list[NoteEvent], chord_window_ms: float) -> int:
-    if not notes:
+def _dedup_ref_count(notes: NoteArrays, chord_window_ms: float) -> int:
+    if not len(notes):
         return 0
-    sorted_notes = sorted(notes, key=lambda n: (n.start_sec, n.pitch))
-    kept = 0
-    last_seen: dict[int, float] = {}
+    order = np.lexsort((notes.start_sec, notes.pitch))
+    pitches = notes.pitch[order]
+    starts = notes.start_sec[order]
     win_sec = chord_window_ms / 1000.0
-    for note in sorted_notes:
-        last_time = last_seen.get(note.pitch)
-        if last_time is None or (note.start_sec - last_time) > win_sec:
+    # A note further than the window from the previous same-pitch note is
+    # always kept; only runs of close notes need the sequential rule.
+    close = np.flatnonzero((pitches[1:] == pitches[:-1]) & ~(starts[1:] - starts[:-1] > win_sec)) + 1
+    kept = len(notes) - close.size
+    start_list = starts.tolist()
+    last_time = 0.0
+    prev_idx = -1
+    for idx in close.tolist():
+        if idx != prev_idx + 1:
+            last_time = start_list[idx - 1]
+        if (start_list[idx] - last_time) > win_sec:
             kept += 1
-            last_seen[note.pitch] = note.start_sec
+            last_time = start_list[idx]
+        prev_idx = idx
     return kept
 
 
@@ -80,54 +90,60 @@ def _validate_timing_meta(meta: dict) -> None:
         raise ValueError("invalid bpm: must be in range 20..240")
 
 
-def _slice_to_segment(notes: list[NoteEvent], segment_bounds: tuple[float, float] | None) -> list[NoteEvent]:
+def _segment_notes(notes: list[NoteEvent], segment_bounds: tuple[float, float] | None) -> list[NoteEvent]:
     if segment_bounds is None:
         return notes
     start_sec, end_sec = segment_bounds
-    return [note for note in notes if start_sec <= note.start_sec < end_sec]
-
-
-def _shift_notes(notes: list[NoteEvent], offset_sec: float) -> list[NoteEvent]:
-    if offset_sec == 0:
-        return notes
+    if start_sec == 0:
+        return [note for note in notes if 0 <= note.start_sec < end_sec]
     return [
-        replace(
-            note,
-            start_sec=note.start_sec - offset_sec,
-            end_sec=note.end_sec - offset_sec,
+        NoteEvent(
+            pitch=note.pitch,
+            pitch_name=note.pitch_name,
+            start_sec=note.start_sec - start_sec,
+            end_sec=note.end_sec - start_sec,
+            dur_sec=note.dur_sec,
+            velocity=note.velocity,
+            hand=note.hand,
         )
         for note in notes
+        if start_sec <= note.start_sec < end_sec
     ]
 
 
 def _select_valid_matches(
-    ref_notes: list[NoteEvent],
-    attempt_notes: list[NoteEvent],
+    ref_notes: NoteArrays,
+    attempt_notes: NoteArrays,
     alignment: AlignmentResult,
     path: list[tuple[int, int]],
     match_tol_ms: float,
 ) -> list[tuple[int, int]]:
+    if not path:
+        return []
+    pairs = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    ref_idx = pairs[:, 0]
+    attempt_idx = pairs[:, 1]
+    in_range = (ref_idx < len(ref_notes)) & (attempt_idx < len(attempt_notes))
+    ref_idx = ref_idx[in_range]
+    attempt_idx = attempt_idx[in_range]
+    attempt_start = _warped_attempt_starts(attempt_notes.start_sec, alignment=alignment)
+    keep = (ref_notes.pitch[ref_idx] == attempt_notes.pitch[attempt_idx]) & ~(
+        np.abs((attempt_start[attempt_idx] - ref_notes.start_sec[ref_idx]) * 1000.0) > match_tol_ms
+    )
+    candidates = list(zip(ref_idx[keep].tolist(), attempt_idx[keep].tolist()))
+    if len(set(ref_idx[keep].tolist())) == len(candidates) == len(set(attempt_idx[keep].tolist())):
+        return candidates
+
+    # Repeated indices: the first valid pair claims each ref/attempt note.
     valid: list[tuple[int, int]] = []
     seen_ref: set[int] = set()
     seen_attempt: set[int] = set()
-    for ref_idx, attempt_idx in path:
-        if ref_idx in seen_ref or attempt_idx in seen_attempt:
-            continue
-        if ref_idx >= len(ref_notes) or attempt_idx >= len(attempt_notes):
-            continue
-        ref_note = ref_notes[ref_idx]
-        attempt_note = attempt_notes[attempt_idx]
-        if ref_note.pitch != attempt_note.pitch:
-            continue
-        attempt_start_sec = _warped_attempt_start_sec(
-            attempt_note=attempt_note,
-            alignment=alignment,
-        )
-        if abs((attempt_start_sec - ref_note.start_sec) * 1000.0) > match_tol_ms:
+    for ref_i, attempt_i in candidates:
+        if ref_i in seen_ref or attempt_i in seen_attempt:
             continue
-        seen_ref.add(ref_idx)
-        seen_attempt.add(attempt_idx)
-        valid.append((ref_idx, attempt_idx))
+        seen_ref.add(ref_i)
+        seen_attempt.add(attempt_i)
+        valid.append((ref_i, attempt_i))
     return valid
 
 
@@ -139,53 +155,44 @@ def _quality_tier(match_rate: float) -> str:
     return "too_low"
 
 
-def _safe_median(values: list[float]) -> float:
-    return float(median(values)) if values else 0.0
+def _safe_median(values: np.ndarray) -> float:
+    return float(np.median(values)) if values.size else 0.0
 
 
-def _safe_p90(values: list[float]) -> float:
-    if not values:
+def _safe_p90(values: np.ndarray) -> float:
+    if not values.size:
         return 0.0
-    sorted_vals = sorted(values)
-    idx = min(len(sorted_vals) - 1, int(round(0.9 * (len(sorted_vals) - 1))))
-    return float(sorted_vals[idx])
+    idx = min(values.size - 1, int(round(0.9 * (values.size - 1))))
+    return float(np.partition(values, idx)[idx])
 
 
-def _warped_attempt_start_sec(
-    attempt_note: NoteEvent,
-    alignment: AlignmentResult,
-) -> float:
+def _safe_mean(values: np.ndarray) -> float | None:
+    return float(values.mean()) if values.size else None
+
+
+def _warped_attempt_starts(starts: np.ndarray, alignment: AlignmentResult) -> np.ndarray:
     if alignment.warp_scale is None or alignment.warp_offset_sec is None:
-        return attempt_note.start_sec
-    return (attempt_note.start_sec * alignment.warp_scale) + alignment.warp_offset_sec
+        return starts
+    return (starts * alignment.warp_scale) + alignment.warp_offset_sec
 
 
 def _build_metrics(
-    ref_notes: list[NoteEvent],
-    attempt_notes: list[NoteEvent],
+    ref_notes: NoteArrays,
+    attempt_notes: NoteArrays,
     matches: list[tuple[int, int]],
     alignment: AlignmentResult,
 ) -> dict:
-    deltas_ms: list[float] = []
-    duration_ratios: list[float] = []
-
-    for ref_idx, attempt_idx in matches:
-        ref_note = ref_notes[ref_idx]
-        attempt_note = attempt_notes[attempt_idx]
-        attempt_start_sec = _warped_attempt_start_sec(
-            attempt_note=attempt_note,
-            alignment=alignment,
-        )
-        deltas_ms.append(
-            (attempt_start_sec - ref_note.start_sec) * 1000.0
-        )
-        if ref_note.dur_sec > 0:
-            duration_ratios.append(attempt_note.dur_sec / ref_note.dur_sec)
-
-    left_vel = [n.velocity for n in attempt_notes if n.hand == "L"]
-    right_vel = [n.velocity for n in attempt_notes if n.hand == "R"]
-    left_mean = float(sum(left_vel) / len(left_vel)) if left_vel else None
-    right_mean = float(sum(right_vel) / len(right_vel)) if right_vel else None
+    pairs = np.asarray(matches, dtype=np.int64).reshape(-1, 2)
+    ref_idx = pairs[:, 0]
+    attempt_idx = pairs[:, 1]
+    attempt_start = _warped_attempt_starts(attempt_notes.start_sec, alignment)
+    deltas_ms = (attempt_start[attempt_idx] - ref_notes.start_sec[ref_idx]) * 1000.0
+    matched_ref_dur = ref_notes.dur_sec[ref_idx]
+    has_duration = matched_ref_dur > 0
+    duration_ratios = attempt_notes.dur_sec[attempt_idx][has_duration] / matched_ref_dur[has_duration]
+
+    left_mean = _safe_mean(attempt_notes.velocity[attempt_notes.hand == "L"])
+    right_mean = _safe_mean(attempt_notes.velocity[attempt_notes.hand == "R"])
     imbalance = None
     if left_mean is not None and right_mean is not None:
         top = max(left_mean, right_mean)
@@ -193,18 +200,16 @@ def _build_metrics(
 
     short_ratio = 0.0
     long_ratio = 0.0
-    if duration_ratios:
-        short_ratio = len([r for r in duration_ratios if r <
-                          0.6]) / len(duration_ratios)
-        long_ratio = len([r for r in duration_ratios if r >
-                         1.5]) / len(duration_ratios)
+    if duration_ratios.size:
+        short_ratio = int(np.count_nonzero(duration_ratios < 0.6)) / duration_ratios.size
+        long_ratio = int(np.count_nonzero(duration_ratios > 1.5)) / duration_ratios.size
 
-    abs_deltas = [abs(v) for v in deltas_ms]
+    abs_deltas = np.abs(deltas_ms)
     return {
         "timing": {
             "onset_error_ms_median": _safe_median(deltas_ms),
             "onset_error_ms_p90_abs": _safe_p90(abs_deltas),
-            "onset_error_ms_mean_abs": float(sum(abs_deltas) / len(abs_deltas)) if abs_deltas else 0.0,
+            "onset_error_ms_mean_abs": float(abs_deltas.mean()) if abs_deltas.size else 0.0,
         },
         "duration": {
             "duration_ratio_median": _safe_median(duration_ratios),
@@ -232,15 +237,11 @@ def analyze(
     segment_bounds = _segment_time_bounds(meta, segment_id=segment_id)
     raw_ref_notes = midi_to_notes(ref_midi, hand_split=hand_split)
     raw_attempt_notes = midi_to_notes(attempt_midi, hand_split=hand_split)
-    ref_notes = _slice_to_segment(raw_ref_notes, segment_bounds)
-    attempt_notes = _slice_to_segment(raw_attempt_notes, segment_bounds)
-    if segment_bounds is not None:
-        start_sec, _end_sec = segment_bounds
-        ref_notes = _shift_notes(ref_notes, start_sec)
-        if attempt_is_segment_relative:
-            attempt_notes = [note for note in raw_attempt_notes if note.start_sec >= 0]
-        else:
-            attempt_notes = _shift_notes(attempt_notes, start_sec)
+    ref_notes = _segment_notes(raw_ref_notes, segment_bounds)
+    if segment_bounds is not None and attempt_is_segment_relative:
+        attempt_notes = [note for note in raw_attempt_notes if note.start_sec >= 0]
+    else:
+        attempt_notes = _segment_notes(raw_attempt_notes, segment_bounds)
 
     engine = aligner or HMMAligner()
     alignment = engine.align_offline(ref_notes, attempt_notes)
@@ -260,15 +261,17 @@ def analyze(
         raise ValueError("invalid duration_long_ratio: must be > 0")
     if short_ratio >= long_ratio:
         raise ValueError("invalid duration ratios: duration_short_ratio must be < duration_long_ratio")
+    ref_arrays = NoteArrays.from_notes(ref_notes)
+    attempt_arrays = NoteArrays.from_notes(attempt_notes)
     valid_matches = _select_valid_matches(
-        ref_notes=ref_notes,
-        attempt_notes=attempt_notes,
+        ref_notes=ref_arrays,
+        attempt_notes=attempt_arrays,
         alignment=alignment,
         path=alignment.path,
         match_tol_ms=match_tol_ms,
     )
 
-    ref_count = _dedup_ref_count(ref_notes, chord_window_ms=chord_window_ms)
+    ref_count = _dedup_ref_count(ref_arrays, chord_window_ms=chord_window_ms)
     matched = len(valid_matches)
     match_rate = 0.0 if ref_count == 0 else matched / ref_count
     events = generate_events(
@@ -279,8 +282,8 @@ def analyze(
         segment_id=segment_id,
     )
     metrics = _build_metrics(
-        ref_notes=ref_notes,
-        attempt_notes=attempt_notes,
+        ref_notes=ref_arrays,
+        attempt_notes=attempt_arrays,
         matches=valid_matches,
         alignment=alignment,
     )
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import asyncio
 import math
 import re
+import threading
 import time
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Literal
 
@@ -11,7 +12,6 @@ import mido
 import pretty_midi
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from xpiano import config, midi_io, reference
 from xpiano.analysis import analyze
@@ -28,10 +28,31 @@ from xpiano.report import (build_history, build_report,
 from xpiano.wait_mode import run_wait_mode
 
 app = typer.Typer(help="XPiano CLI")
-console = Console()
+# CLI text is never Rich markup, so brackets in song/segment ids print verbatim.
+console = Console(markup=False)
+if not console.is_terminal:
+    # Piped output carries no color; skip the per-print repr highlighter.
+    console = Console(markup=False, highlight=False)
 _ATTEMPTS_PATTERN = re.compile(r"^(?:latest\s*-\s*)?(\d+)$", re.IGNORECASE)
 
 
+def _print_table(title: str, columns: list[str], rows: list[tuple[str, ...]]) -> None:
+    if not console.is_terminal:
+        # Piped output: tab-separated lines written straight to the console's
+        # file, skipping Rich layout (and its tab expansion) entirely.
+        lines = [title, "\t".join(columns), *("\t".join(row) for row in rows)]
+        console.file.write("\n".join(lines) + "\n")
+        return
+    from rich.table import Table
+
+    table = Table(title=title)
+    for column in columns:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
+
+
 def _parse_time_signature(time_sig: str) -> tuple[int, int]:
     try:
         left, right = time_sig.split("/", maxsplit=1)
@@ -245,6 +266,48 @@ class _PlaybackAdapter:
         )
 
 
+class _TokenBuffer:
+    """Coalesces streamed tokens into few console writes.
+
+    Buffered text is written once it reaches ``max_chars`` or, via a timer,
+    ``flush_every_ms`` after the first buffered token, so a stalled stream
+    never holds back text it already delivered.
+    """
+
+    def __init__(self, flush_every_ms: int = 30, max_chars: int = 512):
+        self.flush_every_sec = flush_every_ms / 1000
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.size = 0
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def append(self, text: str) -> None:
+        with self._lock:
+            self.parts.append(text)
+            self.size += len(text)
+            if self.size < self.max_chars:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_every_sec, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.parts:
+                return
+            out = console.file
+            out.write("".join(self.parts))
+            out.flush()
+            self.parts.clear()
+            self.size = 0
+
+
 def _stream_coaching_text(
     report_payload: dict,
     provider,
@@ -260,20 +323,32 @@ def _stream_coaching_text(
         output_port=output_port,
     )
 
+    tokens = _TokenBuffer()
+
+    def _on_text(chunk: str) -> None:
+        tokens.append(render_streaming_text(chunk))
+
     def _on_tool(payload: dict) -> None:
+        tokens.flush()
         source = payload.get("source", "reference")
         measures = _measures_str(payload.get("measures"))
         console.print(f"\n{render_playback_indicator(source, measures)}")
 
-    text = asyncio.run(
-        stream_coaching(
-            report=report_payload,
-            provider=provider,
-            playback_engine=adapter,
-            on_text=lambda chunk: console.print(render_streaming_text(chunk), end=""),
-            on_tool=_on_tool,
+    import asyncio
+
+    try:
+        text = asyncio.run(
+            stream_coaching(
+                report=report_payload,
+                provider=provider,
+                playback_engine=adapter,
+                on_text=_on_text,
+                on_tool=_on_tool,
+                on_non_text_event=lambda _event: tokens.flush(),
+            )
         )
-    )
+    finally:
+        tokens.flush()
     console.print()
     return str(text)
 
@@ -379,6 +454,22 @@ def _sorted_history_candidates(rows: list[dict]) -> list[dict]:
     )
 
 
+def _load_latest_report(
+    song: str,
+    segment: str | None,
+    data_dir: Path | None,
+) -> tuple[Path, dict] | None:
+    missing_message = "No report history." if segment is None else "No report found for segment."
+    try:
+        report_path = latest_valid_report_path(song_id=song, segment_id=segment, data_dir=data_dir)
+        return report_path, load_report(report_path)
+    except FileNotFoundError:
+        console.print(missing_message)
+        return None
+    except (ValueError, OSError) as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
 def _safe_note_name(note_number: int) -> str:
     try:
         return pretty_midi.note_number_to_name(int(note_number))
@@ -392,15 +483,10 @@ def devices() -> None:
         entries = midi_io.list_devices()
     except (OSError, RuntimeError, ValueError) as exc:
         raise typer.BadParameter(str(exc)) from exc
-    table = Table(title="MIDI Devices")
-    table.add_column("Kind")
-    table.add_column("Name")
-    for item in entries:
-        table.add_row(item.kind, item.name)
     if not entries:
         console.print("No MIDI devices found.")
         return
-    console.print(table)
+    _print_table("MIDI Devices", ["Kind", "Name"], [(item.kind, item.name) for item in entries])
 
 
 @app.command("setup")
@@ -422,7 +508,7 @@ def setup(
         raise typer.BadParameter("bpm must be in range 20..240")
     if split_pitch is not None and (split_pitch < 0 or split_pitch > 127):
         raise typer.BadParameter("split-pitch must be in range 0..127")
-    config.ensure_config(data_dir=data_dir)
+    cfg = config.ensure_config(data_dir=data_dir)
     parsed_time_sig = _parse_time_signature(time_sig) if time_sig is not None else None
 
     try:
@@ -435,7 +521,7 @@ def setup(
             "bpm": float(bpm) if bpm is not None else 120.0,
             "segments": [],
             "hand_split": {"split_pitch": 60},
-            "tolerance": config.load_config(data_dir=data_dir)["tolerance"],
+            "tolerance": cfg["tolerance"],
         }
     existing_segment = next(
         (s for s in meta.get("segments", []) if s.get("segment_id") == segment),
@@ -482,7 +568,8 @@ def setup(
             "count_in_measures": count_in_measures,
         }
     )
-    meta["segments"] = sorted(segments, key=lambda seg: seg["segment_id"])
+    segments.sort(key=itemgetter("segment_id"))
+    meta["segments"] = segments
     try:
         path = reference.save_meta(song_id=song, meta=meta, data_dir=data_dir)
     except (ValueError, OSError, RuntimeError) as exc:
@@ -518,13 +605,7 @@ def list_song(data_dir: Path | None = typer.Option(None, "--data-dir")) -> None:
     if not songs:
         console.print("No songs configured.")
         return
-    table = Table(title="XPiano Songs")
-    table.add_column("Song")
-    table.add_column("Reference")
-    table.add_column("Segments")
-    table.add_column("Last Match")
-    table.add_column("Missing/Extra")
-    table.add_column("Updated")
+    table_rows: list[tuple[str, ...]] = []
     for song in songs:
         try:
             history_rows = build_history(
@@ -543,15 +624,21 @@ def list_song(data_dir: Path | None = typer.Option(None, "--data-dir")) -> None:
                 f"{_coerce_int(latest.get('missing'))}/"
                 f"{_coerce_int(latest.get('extra'))}"
             )
-        table.add_row(
-            song.song_id,
-            "yes" if song.has_reference else "no",
-            str(song.segments),
-            last_match,
-            last_problem,
-            song.updated_at or "-",
+        table_rows.append(
+            (
+                song.song_id,
+                "yes" if song.has_reference else "no",
+                str(song.segments),
+                last_match,
+                last_problem,
+                song.updated_at or "-",
+            )
         )
-    console.print(table)
+    _print_table(
+        "XPiano Songs",
+        ["Song", "Reference", "Segments", "Last Match", "Missing/Extra", "Updated"],
+        table_rows,
+    )
 
 
 @app.command("record")
@@ -748,38 +835,10 @@ def report(
     song = _require_song(song)
     segment = _require_optional_segment(segment)
     config.ensure_config(data_dir=data_dir)
-    if segment is None:
-        try:
-            report_path = latest_valid_report_path(song_id=song, data_dir=data_dir)
-        except FileNotFoundError:
-            console.print("No report history.")
-            return
-        except OSError as exc:
-            raise typer.BadParameter(str(exc)) from exc
-    else:
-        try:
-            report_path = latest_valid_report_path(
-                song_id=song,
-                segment_id=segment,
-                data_dir=data_dir,
-            )
-        except FileNotFoundError:
-            console.print("No report found for segment.")
-            return
-        except OSError as exc:
-            raise typer.BadParameter(str(exc)) from exc
-    try:
-        payload = load_report(report_path)
-    except FileNotFoundError:
-        if segment is None:
-            console.print("No report history.")
-        else:
-            console.print("No report found for segment.")
+    latest = _load_latest_report(song=song, segment=segment, data_dir=data_dir)
+    if latest is None:
         return
-    except ValueError as exc:
-        raise typer.BadParameter(str(exc)) from exc
-    except OSError as exc:
-        raise typer.BadParameter(str(exc)) from exc
+    report_path, payload = latest
     console.print(f"Report: {report_path}")
     console.print(render_report(payload))
     console.print(render_piano_roll_diff(payload))
@@ -795,38 +854,10 @@ def coach(
     song = _require_song(song)
     segment = _require_optional_segment(segment)
     cfg = config.ensure_config(data_dir=data_dir)
-    if segment is None:
-        try:
-            report_path = latest_valid_report_path(song_id=song, data_dir=data_dir)
-        except FileNotFoundError:
-            console.print("No report history.")
-            return
-        except OSError as exc:
-            raise typer.BadParameter(str(exc)) from exc
-    else:
-        try:
-            report_path = latest_valid_report_path(
-                song_id=song,
-                segment_id=segment,
-                data_dir=data_dir,
-            )
-        except FileNotFoundError:
-            console.print("No report found for segment.")
-            return
-        except OSError as exc:
-            raise typer.BadParameter(str(exc)) from exc
-    try:
-        report_payload = load_report(report_path)
-    except FileNotFoundError:
-        if segment is None:
-            console.print("No report history.")
-        else:
-            console.print("No report found for segment.")
+    latest = _load_latest_report(song=song, segment=segment, data_dir=data_dir)
+    if latest is None:
         return
-    except ValueError as exc:
-        raise typer.BadParameter(str(exc)) from exc
-    except OSError as exc:
-        raise typer.BadParameter(str(exc)) from exc
+    report_path, report_payload = latest
 
     provider = None
     try:
@@ -1024,21 +1055,20 @@ def history(
     if not rows:
         console.print("No report history.")
         return
-    table = Table(title=f"History: {song}")
-    table.add_column("Report")
-    table.add_column("Segment")
-    table.add_column("Match")
-    table.add_column("Missing")
-    table.add_column("Extra")
-    for row in rows:
-        table.add_row(
-            _row_text(row, "filename"),
-            _row_text(row, "segment_id"),
-            f"{_coerce_float(row.get('match_rate')):.2f}",
-            str(_coerce_int(row.get("missing"))),
-            str(_coerce_int(row.get("extra"))),
-        )
-    console.print(table)
+    _print_table(
+        f"History: {song}",
+        ["Report", "Segment", "Match", "Missing", "Extra"],
+        [
+            (
+                _row_text(row, "filename"),
+                _row_text(row, "segment_id"),
+                f"{_coerce_float(row.get('match_rate')):.2f}",
+                str(_coerce_int(row.get("missing"))),
+                str(_coerce_int(row.get("extra"))),
+            )
+            for row in rows
+        ],
+    )
 
 
 @app.command("compare")
@@ -1063,7 +1093,9 @@ def compare(
         rows = build_history(
             song_id=song,
             segment_id=segment,
-            attempts=max(2, attempt_count),
+            # A fixed segment compares the last two rows; otherwise --attempts
+            # is the window searched for a same-segment predecessor.
+            attempts=2 if segment is not None else max(2, attempt_count),
             data_dir=data_dir,
         )
     except (ValueError, OSError, RuntimeError) as exc:
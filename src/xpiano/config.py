@@ -7,6 +7,10 @@ from typing import Any
 
 import yaml  # type: ignore[import-untyped]
 
+# libyaml-backed loader/dumper when PyYAML was built with it; same safe schema either way.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 DEFAULT_CONFIG: dict[str, Any] = {
     "llm": {
         "provider": "claude",
@@ -32,6 +36,10 @@ DEFAULT_CONFIG: dict[str, Any] = {
 }
 
 
+# Parsed config per file, reused while mtime/size/inode are unchanged.
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
+
 def xpiano_home(data_dir: str | Path | None = None) -> Path:
     if data_dir is not None:
         return Path(data_dir).expanduser()
@@ -49,15 +57,20 @@ def songs_path(data_dir: str | Path | None = None) -> Path:
     return xpiano_home(data_dir) / "songs"
 
 
-def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-    result = copy.deepcopy(base)
+def _merge_into(target: dict[str, Any], override: dict[str, Any]) -> None:
     for key, value in override.items():
-        base_value = result.get(key)
-        if isinstance(base_value, dict):
+        current = target.get(key)
+        if isinstance(current, dict):
             if isinstance(value, dict):
-                result[key] = _deep_merge(base_value, value)
+                _merge_into(current, value)
             continue
-        result[key] = value
+        target[key] = value
+
+
+def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    # Copy base once, then merge in place instead of re-copying every level.
+    result = copy.deepcopy(base)
+    _merge_into(result, override)
     return result
 
 
@@ -65,22 +78,35 @@ def save_config(config: dict[str, Any], data_dir: str | Path | None = None) -> P
     home = xpiano_home(data_dir)
     home.mkdir(parents=True, exist_ok=True)
     path = config_path(home)
+    # mtime ticks can be coarser than back-to-back writes; never trust a stale entry.
+    _CONFIG_CACHE.pop(str(path.absolute()), None)
     with path.open("w", encoding="utf-8") as fp:
-        yaml.safe_dump(config, fp, sort_keys=False, allow_unicode=False)
+        yaml.dump(config, fp, Dumper=_YAML_DUMPER, sort_keys=False, allow_unicode=False)
     songs_path(home).mkdir(parents=True, exist_ok=True)
     return path
 
 
+def _file_signature(path: Path) -> tuple[int, int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
 def load_config(data_dir: str | Path | None = None) -> dict[str, Any]:
     path = config_path(data_dir)
     if not path.exists():
-        save_config(copy.deepcopy(DEFAULT_CONFIG), data_dir=data_dir)
+        save_config(DEFAULT_CONFIG, data_dir=data_dir)
         return copy.deepcopy(DEFAULT_CONFIG)
 
+    cache_key = str(path.absolute())
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == _file_signature(path):
+        songs_path(data_dir).mkdir(parents=True, exist_ok=True)
+        return copy.deepcopy(cached[1])
+
     try:
         with path.open("r", encoding="utf-8") as fp:
             try:
-                loaded = yaml.safe_load(fp) or {}
+                loaded = yaml.load(fp, Loader=_YAML_LOADER) or {}
             except yaml.YAMLError:
                 loaded = {}
     except UnicodeDecodeError:
@@ -91,6 +117,7 @@ def load_config(data_dir: str | Path | None = None) -> dict[str, Any]:
     if merged != loaded:
         save_config(merged, data_dir=data_dir)
     songs_path(data_dir).mkdir(parents=True, exist_ok=True)
+    _CONFIG_CACHE[cache_key] = (_file_signature(path), copy.deepcopy(merged))
     return merged
 
 
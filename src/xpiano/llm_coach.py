@@ -304,7 +304,7 @@ def save_coaching(
         path = out_dir / f"{ts}_{suffix_idx:02d}.json"
         suffix_idx += 1
     with path.open("w", encoding="utf-8") as fp:
-        json.dump(coaching, fp, ensure_ascii=True, indent=2)
+        fp.write(json.dumps(coaching, ensure_ascii=True, indent=2))
     return path
 
 
@@ -314,6 +314,7 @@ async def stream_coaching(
     playback_engine: Any,
     on_text: Callable[[str], None] | None = None,
     on_tool: Callable[[dict[str, Any]], None] | None = None,
+    on_non_text_event: Callable[[dict[str, Any]], None] | None = None,
 ) -> str:
     prompt = build_coaching_prompt(report)
     chunks: list[str] = []
@@ -368,4 +369,6 @@ async def stream_coaching(
                 chunks.append(text)
                 if on_text is not None:
                     on_text(text)
+        elif on_non_text_event is not None:
+            on_non_text_event(event)
     return "".join(chunks)
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
+import sys
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator, Callable
-from typing import Any
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
-import anthropic
+
+def _lazy_module(name: str) -> ModuleType:
+    # The SDK costs about a second to import; load it on first attribute access.
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+if TYPE_CHECKING:
+    import anthropic
+else:
+    anthropic = _lazy_module("anthropic")
 
 
 class _ToolExecutionError(RuntimeError):
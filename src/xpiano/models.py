@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Literal
 
+import numpy as np
+
 
 @dataclass
 class NoteEvent:
@@ -15,6 +17,33 @@ class NoteEvent:
     hand: Literal["L", "R", "U"]
 
 
+@dataclass
+class NoteArrays:
+    """Column view of a note list for vectorized consumers."""
+
+    pitch: np.ndarray
+    start_sec: np.ndarray
+    end_sec: np.ndarray
+    dur_sec: np.ndarray
+    velocity: np.ndarray
+    hand: np.ndarray
+
+    @classmethod
+    def from_notes(cls, notes: list[NoteEvent]) -> NoteArrays:
+        count = len(notes)
+        return cls(
+            pitch=np.fromiter((n.pitch for n in notes), dtype=np.int64, count=count),
+            start_sec=np.fromiter((n.start_sec for n in notes), dtype=np.float64, count=count),
+            end_sec=np.fromiter((n.end_sec for n in notes), dtype=np.float64, count=count),
+            dur_sec=np.fromiter((n.dur_sec for n in notes), dtype=np.float64, count=count),
+            velocity=np.fromiter((n.velocity for n in notes), dtype=np.int64, count=count),
+            hand=np.array([n.hand for n in notes], dtype="U1"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pitch)
+
+
 @dataclass
 class MeasureBeat:
     measure: int
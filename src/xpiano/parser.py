@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -15,7 +17,21 @@ def _to_hand(pitch: int, split_pitch: int) -> Literal["L", "R", "U"]:
 def midi_to_notes(midi_path: str | Path, hand_split: int = 60) -> list[NoteEvent]:
     if hand_split < 0 or hand_split > 127:
         raise ValueError("hand_split must be between 0 and 127")
-    midi = pretty_midi.PrettyMIDI(str(midi_path))
+    path = os.path.abspath(midi_path)
+    stat = os.stat(path)
+    # mtime/size/inode in the key invalidate the entry when the file is rewritten or replaced.
+    return list(_parse_notes(path, stat.st_mtime_ns, stat.st_size, stat.st_ino, hand_split))
+
+
+@lru_cache(maxsize=64)
+def _parse_notes(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    inode: int,
+    hand_split: int,
+) -> tuple[NoteEvent, ...]:
+    midi = pretty_midi.PrettyMIDI(path)
     notes: list[NoteEvent] = []
     for instrument in midi.instruments:
         for note in instrument.notes:
@@ -31,4 +47,4 @@ def midi_to_notes(midi_path: str | Path, hand_split: int = 60) -> list[NoteEvent
                 )
             )
     notes.sort(key=lambda n: (n.start_sec, n.pitch, n.end_sec))
-    return notes
+    return tuple(notes)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 import math
 import shutil
@@ -13,6 +14,9 @@ import mido
 from xpiano import config, midi_io, parser
 from xpiano.schemas import validate
 
+# Validated meta.json per file, reused while mtime/size/inode are unchanged.
+_META_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
 
 @dataclass
 class SongInfo:
@@ -157,7 +161,7 @@ def import_reference(
     notes = parser.midi_to_notes(target_ref)
     ref_notes_path = target_song_dir / "reference_notes.json"
     with ref_notes_path.open("w", encoding="utf-8") as fp:
-        json.dump([asdict(n) for n in notes], fp, ensure_ascii=True, indent=2)
+        fp.write(json.dumps([asdict(n) for n in notes], ensure_ascii=True, indent=2))
 
     defaults = _extract_midi_defaults(target_ref)
     _validate_midi_defaults(defaults)
@@ -204,8 +208,9 @@ def save_meta(song_id: str, meta: dict[str, Any], data_dir: str | Path | None =
     if errors:
         raise ValueError(f"invalid meta.json: {'; '.join(errors)}")
     path = song_dir(song_id, data_dir=data_dir) / "meta.json"
+    _META_CACHE.pop(str(path.absolute()), None)
     with path.open("w", encoding="utf-8") as fp:
-        json.dump(meta, fp, ensure_ascii=True, indent=2)
+        fp.write(json.dumps(meta, ensure_ascii=True, indent=2))
     return path
 
 
@@ -213,11 +218,17 @@ def load_meta(song_id: str, data_dir: str | Path | None = None) -> dict[str, Any
     path = song_dir(song_id, data_dir=data_dir) / "meta.json"
     if not path.exists():
         raise FileNotFoundError(f"meta.json missing for song: {song_id}")
-    with path.open("r", encoding="utf-8") as fp:
-        meta = json.load(fp)
+    cache_key = str(path.absolute())
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _META_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    meta = json.loads(path.read_bytes())
     errors = validate("meta", meta)
     if errors:
         raise ValueError(f"invalid meta.json: {'; '.join(errors)}")
+    _META_CACHE[cache_key] = (signature, copy.deepcopy(meta))
     return meta
 
 
@@ -243,8 +254,7 @@ def list_songs(data_dir: str | Path | None = None) -> list[SongInfo]:
             has_meta = False
         if has_meta:
             try:
-                with meta_file.open("r", encoding="utf-8") as fp:
-                    meta_data = json.load(fp)
+                meta_data = json.loads(meta_file.read_bytes())
                 if isinstance(meta_data, dict):
                     raw_segments = meta_data.get("segments", [])
                     segments = len(raw_segments) if isinstance(raw_segments, list) else 0
@@ -292,7 +302,7 @@ def save_reference(song_id: str, midi: mido.MidiFile, data_dir: str | Path | Non
     notes = parser.midi_to_notes(target_ref)
     ref_notes_path = target_song_dir / "reference_notes.json"
     with ref_notes_path.open("w", encoding="utf-8") as fp:
-        json.dump([asdict(n) for n in notes], fp, ensure_ascii=True, indent=2)
+        fp.write(json.dumps([asdict(n) for n in notes], ensure_ascii=True, indent=2))
     return target_ref
 
 
@@ -386,8 +396,7 @@ def load_reference_notes(song_id: str, data_dir: str | Path | None = None) -> li
     if not path.exists():
         raise FileNotFoundError(
             f"reference_notes.json missing for song: {song_id}")
-    with path.open("r", encoding="utf-8") as fp:
-        payload = json.load(fp)
+    payload = json.loads(path.read_bytes())
     if not isinstance(payload, list):
         raise ValueError("reference_notes.json must be a list")
     return payload
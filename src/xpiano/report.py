@@ -154,7 +154,7 @@ def save_report(report: dict[str, Any], song_id: str, data_dir: str | Path | Non
         path = reports_dir / f"{ts}_{suffix_idx:02d}.json"
         suffix_idx += 1
     with path.open("w", encoding="utf-8") as fp:
-        json.dump(report, fp, ensure_ascii=True, indent=2)
+        fp.write(json.dumps(report, ensure_ascii=True, indent=2))
     return path
 
 
@@ -170,17 +170,24 @@ def list_reports(song_id: str, data_dir: str | Path | None = None) -> list[Path]
     if not has_reports:
         return []
     try:
-        return sorted(reports_dir.glob("*.json"))
+        # Report names are timestamps; comparing name strings is much cheaper
+        # than full Path comparisons and gives the same order within one dir.
+        return sorted(reports_dir.glob("*.json"), key=lambda path: path.name)
     except OSError:
         return []
 
 
+class _InvalidReportError(ValueError):
+    def __init__(self, message: str, payload: Any):
+        super().__init__(message)
+        self.payload = payload
+
+
 def load_report(path: str | Path) -> dict[str, Any]:
-    with Path(path).open("r", encoding="utf-8") as fp:
-        payload = json.load(fp)
+    payload = json.loads(Path(path).read_bytes())
     errors = validate("report", payload)
     if errors:
-        raise ValueError(f"invalid report.json: {'; '.join(errors)}")
+        raise _InvalidReportError(f"invalid report.json: {'; '.join(errors)}", payload)
     return payload
 
 
@@ -218,19 +225,22 @@ def build_history(
     target_segment = _normalize_segment_id(segment_id)
     paths = list_reports(song_id=song_id, data_dir=data_dir)
     rows: list[dict[str, Any]] = []
-    for path in paths:
+    # Paths are sorted by filename, so walk newest-first and stop once enough
+    # rows are collected instead of parsing every report.
+    for path in reversed(paths):
+        if len(rows) == attempts:
+            break
         try:
             report = load_report(path)
         except FileNotFoundError:
             continue
-        except ValueError:
-            try:
-                with path.open("r", encoding="utf-8") as fp:
-                    report = json.load(fp)
-            except (FileNotFoundError, ValueError):
-                continue
-            if not isinstance(report, dict):
+        except _InvalidReportError as exc:
+            # History rows tolerate schema drift; reuse the parsed payload.
+            if not isinstance(exc.payload, dict):
                 continue
+            report = exc.payload
+        except ValueError:
+            continue
         report_segment = _normalize_segment_id(report.get("segment_id"))
         if target_segment is not None and report_segment != target_segment:
             continue
@@ -253,6 +263,5 @@ def build_history(
                 "ref_notes": ref_notes,
             }
         )
-    rows.sort(key=lambda item: item["filename"])
-    rows = rows[-attempts:]
+    rows.reverse()
     return rows
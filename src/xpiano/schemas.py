@@ -2,8 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 
-from jsonschema import Draft202012Validator
-
 META_SCHEMA: dict[str, Any] = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
     "$id": "xpiano.meta.schema.json",
@@ -316,6 +314,9 @@ def validate(schema_name: str, data: dict[str, Any]) -> list[str]:
     schema = SCHEMAS.get(schema_name)
     if schema is None:
         return [f"unknown schema: {schema_name}"]
+    # jsonschema adds ~60ms to startup; only commands that validate pay for it.
+    from jsonschema import Draft202012Validator
+
     validator = Draft202012Validator(schema)
     errors: list[str] = []
     for err in sorted(validator.iter_errors(data), key=lambda e: list(e.path)):
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import subprocess
+import sys
+from collections.abc import Callable
 from pathlib import Path
 
 import mido
@@ -29,3 +32,15 @@ def sample_midi_path(tmp_path: Path) -> Path:
     track.append(mido.Message("note_off", note=64, velocity=0, time=480))
     mid.save(str(midi_path))
     return midi_path
+
+
+@pytest.fixture()
+def loads_on_import() -> Callable[[str, str], bool]:
+    """Whether importing ``module`` in a fresh interpreter loads ``dependency``."""
+
+    def _loads(module: str, dependency: str) -> bool:
+        code = f"import sys, {module}; print({dependency!r} in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return result.stdout.strip() == "True"
+
+    return _loads
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import pytest
+
+from xpiano import alignment
 from xpiano.alignment import DTWAligner, HMMAligner
 from xpiano.models import NoteEvent
 
@@ -57,3 +60,132 @@ def test_hmm_aligner_skips_inserted_wrong_pitch_without_drifting() -> None:
 
     result = HMMAligner().align_offline(ref, attempt)
     assert result.path == [(0, 0), (1, 2), (2, 3), (3, 4)]
+
+
+def test_band_radius_limits_dp_without_changing_near_diagonal_paths() -> None:
+    ref = [_note(60 + (i % 3) * 2, i * 0.5) for i in range(12)]
+    attempt = [_note(60 + (i % 3) * 2, i * 0.5 + 0.03) for i in range(12)]
+
+    for aligner_cls in (DTWAligner, HMMAligner):
+        full = aligner_cls().align_offline(ref, attempt)
+        banded = aligner_cls(band_radius=1).align_offline(ref, attempt)
+        assert banded.path == full.path
+        assert banded.cost == full.cost
+
+
+@pytest.mark.parametrize("aligner_cls", [DTWAligner, HMMAligner])
+def test_vector_and_scalar_dp_agree_across_column_threshold(aligner_cls, monkeypatch) -> None:
+    # One pitch keeps every DTW bucket above the 128-column cutoff; the extra
+    # attempt note keeps HMM off its identity shortcut.
+    ref = [_note(60, idx * 0.25) for idx in range(150)]
+    attempt = [_note(60, note.start_sec + (0.05 if idx % 3 else -0.04)) for idx, note in enumerate(ref)]
+    attempt.insert(70, _note(60, 17.6))
+    assert min(len(ref), len(attempt)) >= alignment._VECTOR_MIN_COLS
+
+    calls: list[int] = []
+    real_fill_dp = alignment._fill_dp
+
+    def _counting_fill_dp(*args, **kwargs):
+        calls.append(1)
+        return real_fill_dp(*args, **kwargs)
+
+    monkeypatch.setattr(alignment, "_fill_dp", _counting_fill_dp)
+    vector = aligner_cls().align_offline(ref, attempt)
+    assert calls
+
+    monkeypatch.setattr(alignment, "_VECTOR_MIN_COLS", len(attempt) * 3)
+    calls.clear()
+    scalar = aligner_cls().align_offline(ref, attempt)
+    assert not calls
+    assert vector.path == scalar.path
+    assert vector.cost == scalar.cost
+
+
+def _tie_heavy_pair() -> tuple[list[NoteEvent], list[NoteEvent]]:
+    # Quarter-second grid: shifts of 0.25/0.5 make match, skip-ref and
+    # skip-attempt costs tie exactly; m != n keeps HMM off its shortcut.
+    pitches = [60, 62, 60, 64, 60, 62]
+    ref = [_note(pitches[idx % len(pitches)], idx * 0.25) for idx in range(24)]
+    attempt: list[NoteEvent] = []
+    for idx, note in enumerate(ref):
+        if idx % 7 == 3:
+            continue
+        shift = (0.0, 0.25, 0.5, -0.25)[idx % 4]
+        attempt.append(_note(note.pitch, max(0.0, note.start_sec + shift)))
+        if idx % 5 == 0:
+            attempt.append(_note(60, note.start_sec + 0.25))
+    attempt.sort(key=lambda note: (note.start_sec, note.pitch))
+    return ref, attempt
+
+
+@pytest.mark.parametrize("kernel", ["_sweep_rows", "_sweep_antidiagonals"])
+@pytest.mark.parametrize("band_radius", [None, 2])
+@pytest.mark.parametrize(
+    "make_aligner",
+    [
+        lambda band: DTWAligner(gap_penalty_sec=0.25, band_radius=band),
+        # Free skips and onset-blind costs make most HMM cells three-way ties.
+        lambda band: HMMAligner(delete_cost=0.0, insert_cost=0.0, onset_cost_weight=0.0, band_radius=band),
+    ],
+    ids=["dtw", "hmm"],
+)
+def test_vector_kernels_match_scalar_fill(kernel, band_radius, make_aligner, monkeypatch) -> None:
+    ref, attempt = _tie_heavy_pair()
+    assert len(ref) != len(attempt)
+    expected = make_aligner(band_radius).align_offline(ref, attempt)
+
+    called: list[str] = []
+
+    def _spy(name: str):
+        real = getattr(alignment, name)
+
+        def _wrapped(*args, **kwargs):
+            called.append(name)
+            return real(*args, **kwargs)
+
+        return _wrapped
+
+    for name in ("_sweep_rows", "_sweep_antidiagonals", "_fill_dp_scalar"):
+        monkeypatch.setattr(alignment, name, _spy(name))
+    monkeypatch.setattr(alignment, "_VECTOR_MIN_COLS", 1)
+    monkeypatch.setattr(
+        alignment, "_ANTIDIAGONAL_MIN_CELLS", 1 if kernel == "_sweep_antidiagonals" else len(attempt) * 3
+    )
+    result = make_aligner(band_radius).align_offline(ref, attempt)
+
+    assert called and set(called) == {kernel}
+    assert result.path == expected.path
+    assert result.cost == expected.cost
+
+
+def test_band_radius_rejects_negative_values() -> None:
+    with pytest.raises(ValueError, match="band_radius"):
+        DTWAligner(band_radius=-1)
+    with pytest.raises(ValueError, match="band_radius"):
+        HMMAligner(band_radius=-1)
+
+
+def test_dtw_single_note_bucket_matches_only_within_skip_cost() -> None:
+    near = DTWAligner(gap_penalty_sec=0.2).align_offline([_note(60, 1.0)], [_note(60, 1.3)])
+    far = DTWAligner(gap_penalty_sec=0.2).align_offline([_note(60, 1.0)], [_note(60, 1.5)])
+
+    assert near.path == [(0, 0)]
+    assert abs(near.cost - 0.3) < 1e-9
+    assert far.path == []
+    assert abs(far.cost - 0.4) < 1e-9
+
+
+def test_hmm_identical_sequences_take_diagonal_shortcut() -> None:
+    ref = [_note(60 + (idx % 5), idx * 0.25) for idx in range(300)]
+    attempt = [_note(note.pitch, note.start_sec) for note in ref]
+    result = HMMAligner().align_offline(ref, attempt)
+    assert result.path == [(idx, idx) for idx in range(300)]
+    assert result.cost == 0.0
+
+
+def test_hmm_falls_back_to_dp_when_diagonal_costs_more_than_skips() -> None:
+    ref = [_note(60, idx * 0.5) for idx in range(6)]
+    attempt = [_note(60, note.start_sec + (0.1 if idx % 2 else -0.1)) for idx, note in enumerate(ref)]
+    result = HMMAligner(delete_cost=0.01, insert_cost=0.01).align_offline(ref, attempt)
+    assert len(result.path) < len(ref)
+    assert result.cost < 0.12
@@ -6,8 +6,9 @@ from pathlib import Path
 import mido
 import pytest
 
+from xpiano import analysis as analysis_module
 from xpiano.analysis import AnalysisResult, analyze
-from xpiano.models import AlignmentResult, AnalysisEvent
+from xpiano.models import AlignmentResult, AnalysisEvent, NoteArrays, NoteEvent
 from xpiano.reference import save_meta
 from xpiano.report import build_report, save_report
 from xpiano.schemas import validate
@@ -89,6 +90,25 @@ def test_analysis_quality_tiers(tmp_path: Path) -> None:
     assert bad.match_rate == 0.0
 
 
+def test_dedup_ref_count_measures_window_from_last_kept_note() -> None:
+    def note(pitch: int, start_sec: float) -> NoteEvent:
+        return NoteEvent(
+            pitch=pitch,
+            pitch_name="C4",
+            start_sec=start_sec,
+            end_sec=start_sec + 0.1,
+            dur_sec=0.1,
+            velocity=80,
+            hand="R",
+        )
+
+    # 0.00 kept, 0.03 folded, 0.06 kept (0.06s after 0.00), 0.08 folded; 62 separate.
+    notes = NoteArrays.from_notes([note(60, 0.08), note(60, 0.0), note(62, 0.01), note(60, 0.03), note(60, 0.06)])
+    assert analysis_module._dedup_ref_count(notes, chord_window_ms=50) == 3
+    assert analysis_module._dedup_ref_count(notes, chord_window_ms=0) == 5
+    assert analysis_module._dedup_ref_count(NoteArrays.from_notes([]), chord_window_ms=50) == 0
+
+
 def test_analysis_hmm_alignment_handles_tempo_scaled_attempt(tmp_path: Path) -> None:
     ref_mid = tmp_path / "ref.mid"
     attempt_mid = tmp_path / "attempt.mid"
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import io
 import json
+import time
 from pathlib import Path
 
 import mido
+import pytest
+from rich.console import Console
 from typer.testing import CliRunner
 
 import xpiano.cli as cli_module
@@ -1695,6 +1699,60 @@ def test_record_full_tier_streaming_triggers_playback(
     assert playback_calls[0]["bpm"] == 45
 
 
+def test_stream_coaching_text_flushes_tokens_before_tool_indicator(monkeypatch, capsys) -> None:
+    async def _fake_stream(**kwargs):
+        for chunk in ("Slow ", "down ", "bar 1."):
+            kwargs["on_text"](chunk)
+        kwargs["on_tool"]({"source": "reference", "measures": {"start": 1, "end": 1}})
+        kwargs["on_text"]("Done.")
+        return "Slow down bar 1.Done."
+
+    monkeypatch.setattr("xpiano.cli.stream_coaching", _fake_stream)
+    text = cli_module._stream_coaching_text(
+        report_payload={}, provider=object(), song_id="twinkle", segment_id="default", data_dir=None
+    )
+    out = capsys.readouterr().out
+    assert text == "Slow down bar 1.Done."
+    assert out.index("Slow down bar 1.") < out.index("▶ playback reference") < out.index("Done.")
+
+
+def test_stream_coaching_text_flushes_on_non_text_event(monkeypatch, capsys) -> None:
+    seen: list[str] = []
+
+    async def _fake_stream(**kwargs):
+        kwargs["on_text"]("Checking bar 2")
+        kwargs["on_non_text_event"]({"type": "tool_use", "input": {}})
+        seen.append(capsys.readouterr().out)
+        return "Checking bar 2"
+
+    monkeypatch.setattr("xpiano.cli.stream_coaching", _fake_stream)
+    cli_module._stream_coaching_text(
+        report_payload={}, provider=object(), song_id="twinkle", segment_id="default", data_dir=None
+    )
+    assert seen == ["Checking bar 2"]
+
+
+def test_stream_coaching_text_flushes_while_provider_stalls(monkeypatch, capsys) -> None:
+    seen: list[str] = []
+
+    async def _fake_stream(**kwargs):
+        kwargs["on_text"]("Thinking")
+        # The provider blocks the loop (sync SDK call); the timer still flushes.
+        out = ""
+        deadline = time.monotonic() + 2.0
+        while "Thinking" not in out and time.monotonic() < deadline:
+            time.sleep(0.01)
+            out += capsys.readouterr().out
+        seen.append(out)
+        return "Thinking"
+
+    monkeypatch.setattr("xpiano.cli.stream_coaching", _fake_stream)
+    cli_module._stream_coaching_text(
+        report_payload={}, provider=object(), song_id="twinkle", segment_id="default", data_dir=None
+    )
+    assert seen == ["Thinking"]
+
+
 def test_record_too_low_skips_piano_roll_diff(
     sample_midi_path: Path,
     monkeypatch,
@@ -3706,6 +3764,26 @@ def test_compare_accepts_latest_attempt_selector(monkeypatch) -> None:
     assert captured["attempts"] == 3
 
 
+def test_compare_with_segment_fetches_only_last_two_rows(monkeypatch) -> None:
+    rows = [
+        {"filename": "a.json", "segment_id": "verse1", "match_rate": 0.5, "missing": 5, "extra": 1},
+        {"filename": "b.json", "segment_id": "verse1", "match_rate": 0.7, "missing": 3, "extra": 1},
+    ]
+    captured: dict[str, object] = {}
+
+    def _fake_build_history(**kwargs):
+        captured.update(kwargs)
+        return rows
+
+    monkeypatch.setattr("xpiano.cli.build_history", _fake_build_history)
+    result = runner.invoke(
+        app, ["compare", "--song", "twinkle", "--segment", "verse1", "--attempts", "latest-5"]
+    )
+    assert result.exit_code == 0
+    assert captured["attempts"] == 2
+    assert "Compare: a.json -> b.json" in result.stdout
+
+
 def test_history_handles_malformed_history_rows(monkeypatch) -> None:
     rows = [
         {"filename": None, "segment_id": None, "match_rate": "bad", "missing": "x", "extra": "y"},
@@ -3716,6 +3794,64 @@ def test_history_handles_malformed_history_rows(monkeypatch) -> None:
     assert "0.00" in result.stdout
 
 
+@pytest.mark.parametrize("dependency", ["anthropic.types", "jsonschema"])
+def test_cli_import_defers_heavy_dependency(loads_on_import, dependency: str) -> None:
+    assert not loads_on_import("xpiano.cli", dependency)
+
+
+def test_history_prints_tab_separated_rows_when_piped(monkeypatch) -> None:
+    rows = [
+        {"filename": "a.json", "segment_id": "verse1", "match_rate": 0.5, "missing": 3, "extra": 1},
+    ]
+    monkeypatch.setattr("xpiano.cli.build_history", lambda **kwargs: rows)
+    result = runner.invoke(app, ["history", "--song", "twinkle"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        "History: twinkle",
+        "Report\tSegment\tMatch\tMissing\tExtra",
+        "a.json\tverse1\t0.50\t3\t1",
+    ]
+
+
+def test_history_table_follows_redirected_console_file(monkeypatch) -> None:
+    rows = [
+        {"filename": "a.json", "segment_id": "verse1", "match_rate": 0.5, "missing": 3, "extra": 1},
+    ]
+    monkeypatch.setattr("xpiano.cli.build_history", lambda **kwargs: rows)
+    buffer = io.StringIO()
+    monkeypatch.setattr(cli_module, "console", Console(file=buffer, markup=False, highlight=False))
+    result = runner.invoke(app, ["history", "--song", "twinkle"])
+    assert result.exit_code == 0
+    assert result.stdout == ""
+    assert buffer.getvalue().splitlines() == [
+        "History: twinkle",
+        "Report\tSegment\tMatch\tMissing\tExtra",
+        "a.json\tverse1\t0.50\t3\t1",
+    ]
+
+
+def test_history_renders_rich_table_on_terminal(monkeypatch) -> None:
+    rows = [
+        {"filename": "a.json", "segment_id": "verse1", "match_rate": 0.5, "missing": 3, "extra": 1},
+    ]
+    monkeypatch.setattr("xpiano.cli.build_history", lambda **kwargs: rows)
+    monkeypatch.setattr(cli_module, "console", Console(force_terminal=True, color_system=None, width=100))
+    result = runner.invoke(app, ["history", "--song", "twinkle"])
+    assert result.exit_code == 0
+    assert "\t" not in result.stdout
+    assert "┃ Report" in result.stdout
+    assert "│ a.json" in result.stdout
+
+
+def test_status_lines_print_bracketed_ids_verbatim(xpiano_home: Path) -> None:
+    result = runner.invoke(
+        app,
+        ["setup", "--song", "[red]twinkle", "--segment", "verse1", "--bpm", "80", "--measures", "4"],
+    )
+    assert result.exit_code == 0
+    assert "songs/[red]twinkle/meta.json" in result.stdout.replace("\n", "")
+
+
 def test_history_surfaces_build_history_oserror(monkeypatch) -> None:
     def _raise(**kwargs):
         _ = kwargs
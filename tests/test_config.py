@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import yaml  # type: ignore[import-untyped]
@@ -83,3 +84,51 @@ def test_load_config_ignores_non_mapping_nested_override_for_mapping_key(
     reparsed = yaml.safe_load(cfg_path.read_text(encoding="utf-8"))
     assert isinstance(reparsed, dict)
     assert isinstance(reparsed.get("tolerance", {}).get("timing_grades"), dict)
+
+
+def test_load_config_merge_does_not_share_defaults(tmp_path: Path) -> None:
+    cfg_path = config.config_path(data_dir=tmp_path)
+    cfg_path.parent.mkdir(parents=True, exist_ok=True)
+    cfg_path.write_text("tolerance:\n  match_tol_ms: 64\n", encoding="utf-8")
+
+    loaded = config.load_config(data_dir=tmp_path)
+    loaded["tolerance"]["timing_grades"]["great_ms"] = 1
+    loaded["llm"]["model"] = "changed"
+
+    assert config.DEFAULT_CONFIG["tolerance"]["timing_grades"]["great_ms"] == 25
+    assert config.DEFAULT_CONFIG["llm"]["model"] != "changed"
+
+
+def test_load_config_reuses_parse_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    _ = config.load_config(data_dir=tmp_path)
+    first = config.load_config(data_dir=tmp_path)
+    parses: list[object] = []
+    real_load = yaml.load
+
+    def _counting_load(stream, Loader):
+        parses.append(stream)
+        return real_load(stream, Loader=Loader)
+
+    monkeypatch.setattr(config.yaml, "load", _counting_load)
+    first["llm"]["model"] = "mutated"
+    second = config.load_config(data_dir=tmp_path)
+    assert second["llm"]["model"] == config.DEFAULT_CONFIG["llm"]["model"]
+    assert parses == []
+
+    updated = dict(second, midi={"default_input": "Keys In", "default_output": None})
+    config.save_config(updated, data_dir=tmp_path)
+    third = config.load_config(data_dir=tmp_path)
+    assert third["midi"]["default_input"] == "Keys In"
+    assert len(parses) == 1
+
+
+def test_save_config_invalidates_cache_for_same_size_rewrite(tmp_path: Path) -> None:
+    _ = config.load_config(data_dir=tmp_path)
+    cfg = config.load_config(data_dir=tmp_path)
+    cfg_path = config.config_path(data_dir=tmp_path)
+    before = cfg_path.stat()
+    cfg["llm"]["model"] = cfg["llm"]["model"][:-1] + "X"
+    config.save_config(cfg, data_dir=tmp_path)
+    # Simulate a coarse mtime clock: same size, inode and mtime as before the write.
+    os.utime(cfg_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert config.load_config(data_dir=tmp_path)["llm"]["model"].endswith("X")
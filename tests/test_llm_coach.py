@@ -254,6 +254,23 @@ def test_stream_coaching_calls_playback_engine() -> None:
     assert len(tool_events) == 1
 
 
+def test_stream_coaching_reports_non_text_events() -> None:
+    class Playback:
+        def play(self, **kwargs):
+            _ = kwargs
+
+    events: list[dict] = []
+    asyncio.run(
+        stream_coaching(
+            report=_report(),
+            provider=FakeStreamProvider(),
+            playback_engine=Playback(),
+            on_non_text_event=events.append,
+        )
+    )
+    assert [event["type"] for event in events] == ["tool_use"]
+
+
 def test_stream_coaching_rejects_invalid_tool_payload() -> None:
     class Playback:
         def __init__(self):
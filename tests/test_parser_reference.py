@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -24,6 +25,36 @@ def test_midi_to_notes_rejects_out_of_range_hand_split(sample_midi_path: Path) -
         raise AssertionError("expected ValueError for out-of-range hand_split")
 
 
+def test_midi_to_notes_reuses_parse_until_file_changes(
+    tmp_path: Path,
+    sample_midi_path: Path,
+    monkeypatch,
+) -> None:
+    midi_path = tmp_path / "ref.mid"
+    midi_path.write_bytes(sample_midi_path.read_bytes())
+    calls: list[str] = []
+    real_pretty_midi = parser.pretty_midi.PrettyMIDI
+
+    def counting_pretty_midi(path: str):
+        calls.append(path)
+        return real_pretty_midi(path)
+
+    monkeypatch.setattr(parser.pretty_midi, "PrettyMIDI", counting_pretty_midi)
+    first = parser.midi_to_notes(midi_path)
+    first.clear()
+    second = parser.midi_to_notes(midi_path)
+    assert len(second) == 2
+    assert len(calls) == 1
+
+    midi = mido.MidiFile(midi_path)
+    midi.tracks[0].append(mido.Message("note_on", note=67, velocity=80, time=0))
+    midi.tracks[0].append(mido.Message("note_off", note=67, velocity=0, time=240))
+    midi.save(midi_path)
+    third = parser.midi_to_notes(midi_path)
+    assert len(calls) == 2
+    assert [note.pitch for note in third][-1] == 67
+
+
 def test_import_reference_creates_meta_and_notes(xpiano_home: Path, sample_midi_path: Path) -> None:
     target = reference.import_reference(sample_midi_path, song_id="twinkle")
     assert target.exists()
@@ -112,6 +143,34 @@ def test_import_reference_rejects_out_of_range_midi_beats_per_measure(sample_mid
         raise AssertionError("expected ValueError for out-of-range midi beats_per_measure")
 
 
+def test_load_meta_reuses_validated_meta_until_saved(
+    xpiano_home: Path,
+    sample_midi_path: Path,
+    monkeypatch,
+) -> None:
+    _ = reference.import_reference(sample_midi_path, song_id="twinkle")
+    first = reference.load_meta("twinkle")
+    validations: list[str] = []
+    real_validate = reference.validate
+
+    def _counting_validate(schema_name, data):
+        validations.append(schema_name)
+        return real_validate(schema_name, data)
+
+    monkeypatch.setattr(reference, "validate", _counting_validate)
+    first["bpm"] = 1.0
+    assert reference.load_meta("twinkle")["bpm"] != 1.0
+    assert validations == []
+
+    meta_path = xpiano_home / "songs" / "twinkle" / "meta.json"
+    before = meta_path.stat()
+    updated = reference.load_meta("twinkle")
+    updated["bpm"] = 99.0 if updated["bpm"] != 99.0 else 98.0
+    _ = reference.save_meta("twinkle", updated)
+    os.utime(meta_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert reference.load_meta("twinkle")["bpm"] == updated["bpm"]
+
+
 def test_import_reference_refreshes_meta_tempo_from_midi(
     xpiano_home: Path,
     sample_midi_path: Path,
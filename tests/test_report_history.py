@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from xpiano import report as report_module
 from xpiano.report import build_history, latest_valid_report_path, list_reports
 
 
@@ -48,6 +49,25 @@ def test_build_history_filters_and_limits(xpiano_home: Path) -> None:
     assert limited[0]["filename"] == "20260101_120100.json"
 
 
+def test_build_history_stops_after_newest_attempts(xpiano_home: Path, monkeypatch) -> None:
+    reports = xpiano_home / "songs" / "twinkle" / "reports"
+    reports.mkdir(parents=True, exist_ok=True)
+    for idx in range(5):
+        _write_report(reports / f"20260101_12000{idx}.json", 0.5 + idx / 10, 0, 0)
+    (reports / "20260101_120005.json").write_text("{invalid", encoding="utf-8")
+    loaded: list[str] = []
+    real_load_report = report_module.load_report
+
+    def _counting_load_report(path):
+        loaded.append(Path(path).name)
+        return real_load_report(path)
+
+    monkeypatch.setattr(report_module, "load_report", _counting_load_report)
+    rows = build_history(song_id="twinkle", attempts=2, data_dir=xpiano_home)
+    assert [row["filename"] for row in rows] == ["20260101_120003.json", "20260101_120004.json"]
+    assert loaded == ["20260101_120005.json", "20260101_120004.json", "20260101_120003.json"]
+
+
 def test_latest_valid_report_path_skips_invalid_latest(xpiano_home: Path) -> None:
     reports = xpiano_home / "songs" / "twinkle" / "reports"
     reports.mkdir(parents=True, exist_ok=True)
@@ -172,6 +192,25 @@ def test_build_history_reads_legacy_report_without_schema(xpiano_home: Path) ->
     assert rows[0]["ref_notes"] == 10
 
 
+def test_build_history_parses_legacy_report_once(xpiano_home: Path, monkeypatch) -> None:
+    reports = xpiano_home / "songs" / "twinkle" / "reports"
+    reports.mkdir(parents=True, exist_ok=True)
+    (reports / "20260101_120000.json").write_text(
+        json.dumps({"segment_id": "verse1", "summary": {"match_rate": 0.5}}), encoding="utf-8"
+    )
+    reads: list[Path] = []
+    real_read_bytes = Path.read_bytes
+
+    def _counting_read_bytes(path: Path) -> bytes:
+        reads.append(path)
+        return real_read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", _counting_read_bytes)
+    rows = build_history(song_id="twinkle", attempts=5, data_dir=xpiano_home)
+    assert [row["match_rate"] for row in rows] == [0.5]
+    assert len(reads) == 1
+
+
 def test_build_history_skips_invalid_json_report(xpiano_home: Path) -> None:
     reports = xpiano_home / "songs" / "twinkle" / "reports"
     reports.mkdir(parents=True, exist_ok=True)